@@ -12,13 +12,38 @@ Tools:
 - get_overtakes: Retrieve overtake data showing position changes between drivers
 """
 
+import argparse
 import asyncio
+import csv
+import importlib.util
+import io
+import itertools
+import json
+import os
+import random
 import httpx
-from typing import Any, Optional
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Optional
+from cachetools import TLRUCache, TTLCache
 from mcp.server import Server
 from mcp.types import Tool, TextContent
 from mcp.server.stdio import stdio_server
 
+# orjson decodes large API payloads several times faster than the standard
+# library; it is optional and json is used when it is not installed
+try:
+    import orjson
+    json_loads = orjson.loads
+    
+    def json_dumps(data: Any) -> str:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+except ImportError:
+    json_loads = json.loads
+    
+    def json_dumps(data: Any) -> str:
+        return json.dumps(data, indent=2, ensure_ascii=False)
+
 
 # API Base URL
 BASE_URL = "https://api.openf1.org/v1"
@@ -26,11 +51,364 @@ BASE_URL = "https://api.openf1.org/v1"
 # Initialize MCP server
 app = Server("f1-historical-data")
 
+# HTTP/2 lets concurrent tool calls share one multiplexed connection; it needs
+# the optional h2 package (pip install 'httpx[http2]')
+HTTP2_ENABLED = importlib.util.find_spec("h2") is not None
+
+# Persistent on-disk HTTP cache, used when the optional hishel package is
+# installed so cached responses survive server restarts
+DISK_CACHE_ENABLED = importlib.util.find_spec("hishel") is not None
+DISK_CACHE_TTL = 86400
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".f1cache")
+cache_dir = DEFAULT_CACHE_DIR
+
+# OpenF1 endpoint queried by each tool
+TOOL_ENDPOINTS = {
+    "get_sessions": "sessions",
+    "get_drivers": "drivers",
+    "get_laps": "laps",
+    "get_pit_stops": "pit",
+    "get_overtakes": "overtakes",
+}
+
+# Tool arguments that are passed through to the API as query parameters
+TOOL_PARAMS = {
+    "get_sessions": (
+        "year", "country_name", "circuit_short_name", "session_name", "session_key", "date_start",
+        "session_type", "location", "country_code", "meeting_key", "gmt_offset"
+    ),
+    "get_drivers": ("session_key", "driver_number", "team_name"),
+    "get_laps": ("session_key", "driver_number", "lap_number"),
+    "get_pit_stops": ("session_key", "driver_number", "pit_duration"),
+    "get_overtakes": ("session_key", "overtaking_driver_number", "overtaken_driver_number"),
+}
+
+# Response formats a tool call can ask for; json returns the API records as-is
+DEFAULT_FORMAT = "json"
+FORMAT_PROPERTY = {
+    "type": "string",
+    "enum": ["json", "text"],
+    "description": "Optional: Response format, 'json' (default) for the raw records or 'text' for labelled lines"
+}
+
+# Tools that would otherwise pull an entire season's data from the API
+SESSION_KEY_REQUIRED = {"get_laps", "get_pit_stops", "get_overtakes"}
+
+# What each tool fetches, as named in its error message
+TOOL_DATA_NAMES = {
+    "get_sessions": "sessions",
+    "get_drivers": "drivers",
+    "get_laps": "lap data",
+    "get_pit_stops": "pit stop data",
+    "get_overtakes": "overtake data",
+}
+
+# Text responses with more records than this are written as CSV
+CSV_THRESHOLD = 50
+
+# Paging arguments shared by every tool, so a large result is not formatted
+# and returned in full
+DEFAULT_LIMIT = 500
+LIMIT_PROPERTY = {
+    "type": "integer",
+    "minimum": 1,
+    "default": DEFAULT_LIMIT,
+    "description": f"Optional: Maximum number of records to return (default {DEFAULT_LIMIT})"
+}
+OFFSET_PROPERTY = {
+    "type": "integer",
+    "minimum": 0,
+    "default": 0,
+    "description": "Optional: Number of records to skip, for paging through large results"
+}
+
+# Separator printed between records in tool responses
+SEPARATOR = "-" * 50 + "\n\n"
+
+# Output layout for each record type as (field, line format, required).
+# Required fields are always printed; the rest are skipped when missing.
+SESSION_FIELDS = (
+    ("session_key", "Session Key: {}\n", True),
+    ("session_name", "Name: {}\n", True),
+    ("session_type", "Type: {}\n", True),
+    ("date_start", "Date: {}\n", True),
+    ("location", "Location: {}\n", True),
+    ("country_name", "Country: {}\n", True),
+    ("circuit_short_name", "Circuit: {}\n", True),
+    ("year", "Year: {}\n", True),
+    ("meeting_key", "Meeting Key: {}\n", True),
+)
+
+DRIVER_FIELDS = (
+    ("driver_number", "Driver Number: {}\n", True),
+    ("full_name", "Name: {}\n", True),
+    ("name_acronym", "Abbreviation: {}\n", True),
+    ("team_name", "Team: {}\n", True),
+    ("country_code", "Country: {}\n", True),
+    ("headshot_url", "Headshot: {}\n", True),
+    ("session_key", "Session Key: {}\n", False),
+)
+
+LAP_FIELDS = (
+    ("lap_number", "Lap Number: {}\n", True),
+    ("driver_number", "Driver Number: {}\n", True),
+    ("session_key", "Session Key: {}\n", True),
+    ("lap_duration", "Lap Duration: {} seconds\n", False),
+    ("duration_sector_1", "Sector 1: {} seconds\n", False),
+    ("duration_sector_2", "Sector 2: {} seconds\n", False),
+    ("duration_sector_3", "Sector 3: {} seconds\n", False),
+    ("segments_sector_1", "Sector 1 Segments: {}\n", False),
+    ("segments_sector_2", "Sector 2 Segments: {}\n", False),
+    ("segments_sector_3", "Sector 3 Segments: {}\n", False),
+    ("i1_speed", "Speed Trap 1 (I1): {} km/h\n", False),
+    ("i2_speed", "Speed Trap 2 (I2): {} km/h\n", False),
+    ("st_speed", "Speed Trap (ST): {} km/h\n", False),
+    ("is_pit_out_lap", "Pit Out Lap: {}\n", False),
+    ("date_start", "Start Time: {}\n", False),
+)
+
+PIT_STOP_FIELDS = (
+    ("driver_number", "Driver Number: {}\n", True),
+    ("session_key", "Session Key: {}\n", True),
+    ("lap_number", "Lap Number: {}\n", True),
+    ("pit_duration", "Pit Duration: {} seconds\n", False),
+    ("date", "Time: {}\n", False),
+    ("meeting_key", "Meeting Key: {}\n", False),
+)
+
+OVERTAKE_FIELDS = (
+    ("overtaking_driver_number", "Overtaking Driver: #{}\n", True),
+    ("overtaken_driver_number", "Overtaken Driver: #{}\n", True),
+    ("session_key", "Session Key: {}\n", True),
+    ("lap_number", "Lap Number: {}\n", False),
+    ("date", "Time: {}\n", False),
+    ("meeting_key", "Meeting Key: {}\n", False),
+)
+
+# Shared HTTP client, created on first use and reused for every request, and
+# how long the startup request that opens its first connection may take
+_client: Optional[httpx.AsyncClient] = None
+WARM_UP_TIMEOUT = 5.0
+
+# In-process cache of API responses keyed by (endpoint, params), plus the
+# requests currently in flight so concurrent misses for the same query share
+# a single API call. Data for a specific session or meeting that has finished
+# never changes and is kept much longer than data that is recent, may still be
+# updating, or comes from an open-ended query that later events could extend.
+# Since entries can live for weeks, the cache is bounded by the total number
+# of records it holds rather than by entries; a full race of laps alone is
+# over a thousand records.
+CACHE_TTL = 3600
+HISTORICAL_CACHE_TTL = 30 * 86400
+LIVE_CACHE_TTL = 60
+HISTORICAL_AGE = timedelta(days=1)
+CACHE_MAX_RECORDS = 50_000
+_cache: TLRUCache = TLRUCache(
+    maxsize=CACHE_MAX_RECORDS,
+    ttu=lambda key, data, now: now + data_ttl(key, data),
+    getsizeof=lambda data: len(data) if isinstance(data, list) and data else 1
+)
+_inflight: dict[tuple, asyncio.Task] = {}
+
+# Finished tool responses keyed by tool name and arguments, so repeating an
+# identical tool call skips decoding and formatting as well. These are kept
+# only briefly because they may be built from live data.
+_response_cache: TTLCache = TTLCache(maxsize=256, ttl=LIVE_CACHE_TTL)
+
+# Limit on simultaneous requests to the API, and how often a request that
+# failed with a transient error (timeout, HTTP 429 or 5xx) is retried
+MAX_CONCURRENT_REQUESTS = 8
+MAX_RETRIES = 3
+RETRY_INITIAL_DELAY = 0.2
+RETRY_MAX_DELAY = 5.0
+_request_semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+
+async def get_client() -> httpx.AsyncClient:
+    """
+    Return the shared OpenF1 HTTP client, creating it on first use.
+    
+    Reusing one client keeps connections to the API alive between tool calls,
+    so only the first request pays for the TCP and TLS handshake. When hishel
+    (below 1.0) is installed the client also stores responses under
+    cache_dir, honoring the API's Cache-Control headers.
+    
+    Returns:
+        The shared httpx.AsyncClient
+    """
+    global _client
+    if _client is None:
+        # No custom headers: httpx sets Accept-Encoding itself, asking for
+        # gzip and, when the brotli package is installed, br responses
+        client_options = {
+            "base_url": BASE_URL,
+            "timeout": 30.0,
+            "limits": httpx.Limits(max_keepalive_connections=20, max_connections=100),
+            "http2": HTTP2_ENABLED
+        }
+        if DISK_CACHE_ENABLED:
+            # hishel 1.x dropped AsyncCacheClient and AsyncFileStorage from
+            # the top-level package, and the cache directory may not be
+            # writable; use a plain client in either case
+            try:
+                import hishel
+                _client = hishel.AsyncCacheClient(
+                    storage=hishel.AsyncFileStorage(base_path=Path(cache_dir), ttl=DISK_CACHE_TTL),
+                    **client_options
+                )
+            except (ImportError, AttributeError, OSError):
+                pass
+        if _client is None:
+            _client = httpx.AsyncClient(**client_options)
+    return _client
+
+
+async def warm_client() -> None:
+    """
+    Open a connection to the OpenF1 API ahead of the first tool call.
+    
+    This resolves the API host and completes the TCP and TLS handshakes
+    before they are needed, and lets concurrent first calls share the same
+    HTTP/2 connection instead of racing to open several. Failures are ignored
+    so the server still works when the API is unreachable at startup.
+    """
+    client = await get_client()
+    try:
+        await client.get("sessions", params={"session_key": "latest"}, timeout=WARM_UP_TIMEOUT)
+    except httpx.HTTPError:
+        pass
+
+
+async def close_client() -> None:
+    """Close the shared HTTP client if it has been created."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def data_ttl(key: tuple, data: Any) -> float:
+    """
+    Decide how long an API response may be cached.
+    
+    Args:
+        key: Cache key of the response, as built by fetch_data
+        data: Decoded API response
+        
+    Returns:
+        LIVE_CACHE_TTL for empty results or records dated within
+        HISTORICAL_AGE, HISTORICAL_CACHE_TTL for older records from a query
+        pinned to one session_key or meeting_key, and CACHE_TTL otherwise
+    """
+    if not data:
+        return LIVE_CACHE_TTL
+    
+    # OpenF1 dates are ISO 8601 UTC strings, so the newest sorts last. Some
+    # records have no date (e.g. a lap that is still running), so only the
+    # dated ones are compared.
+    dates = [
+        record.get("date_end") or record.get("date_start") or record.get("date")
+        for record in data
+        if isinstance(record, dict)
+    ]
+    dates = [date for date in dates if date]
+    if not dates:
+        return CACHE_TTL
+    
+    try:
+        latest = datetime.fromisoformat(max(dates))
+    except (TypeError, ValueError):
+        return CACHE_TTL
+    if latest.tzinfo is None:
+        latest = latest.replace(tzinfo=timezone.utc)
+    
+    if datetime.now(timezone.utc) - latest <= HISTORICAL_AGE:
+        return LIVE_CACHE_TTL
+    
+    # Only a query for one concrete session or meeting cannot gain records
+    # later; filters like a country or the current year can
+    params = dict(key[1])
+    pinned = any(
+        isinstance(params.get(name), int) and not isinstance(params.get(name), bool)
+        for name in ("session_key", "meeting_key")
+    )
+    return HISTORICAL_CACHE_TTL if pinned else CACHE_TTL
+
+
+def is_retryable(response: httpx.Response) -> bool:
+    """Return whether a response failed with a status worth retrying."""
+    return response.status_code == 429 or response.status_code >= 500
+
+
+def retry_delay(response: Optional[httpx.Response], attempt: int) -> float:
+    """
+    Work out how long to wait before retrying a failed request.
+    
+    Args:
+        response: The failed response, or None if no response was received
+        attempt: Number of retries already made
+        
+    Returns:
+        Delay in seconds, taken from the Retry-After header when present and
+        otherwise growing exponentially with random jitter up to RETRY_MAX_DELAY
+    """
+    retry_after = response.headers.get("Retry-After") if response is not None else None
+    if retry_after:
+        try:
+            return max(float(retry_after), 0.0)
+        except ValueError:
+            pass
+    delay = RETRY_INITIAL_DELAY * 2 ** attempt + random.uniform(0, RETRY_INITIAL_DELAY)
+    return min(delay, RETRY_MAX_DELAY)
+
+
+async def send_request(endpoint: str, params: Optional[dict] = None) -> httpx.Response:
+    """
+    Send a GET request to the OpenF1 API.
+    
+    At most MAX_CONCURRENT_REQUESTS requests are in flight at once. Requests
+    that time out, fail to connect, or return HTTP 429 or 5xx are retried
+    with backoff up to MAX_RETRIES times, unless the server's Retry-After
+    asks for a longer wait than RETRY_MAX_DELAY.
+    
+    Args:
+        endpoint: API endpoint path
+        params: Optional query parameters
+        
+    Returns:
+        The successful response
+    """
+    client = await get_client()
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            async with _request_semaphore:
+                response = await client.get(endpoint, params=params)
+        except httpx.TransportError:
+            if attempt == MAX_RETRIES:
+                raise
+            await asyncio.sleep(retry_delay(None, attempt))
+            continue
+        
+        if not is_retryable(response) or attempt == MAX_RETRIES:
+            break
+        delay = retry_delay(response, attempt)
+        if delay > RETRY_MAX_DELAY:
+            # The server asked for a longer wait than a tool call should block for
+            break
+        await asyncio.sleep(delay)
+    
+    response.raise_for_status()
+    return response
+
 
 async def fetch_data(endpoint: str, params: Optional[dict] = None) -> Any:
     """
     Fetch data from the OpenF1 API.
     
+    Responses are cached in memory for as long as data_ttl allows, so
+    repeated queries skip the network round-trip, and concurrent calls for
+    the same query share one request.
+    
     Args:
         endpoint: API endpoint path
         params: Optional query parameters
@@ -38,459 +416,685 @@ async def fetch_data(endpoint: str, params: Optional[dict] = None) -> Any:
     Returns:
         JSON response data
     """
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        url = f"{BASE_URL}/{endpoint}"
-        response = await client.get(url, params=params)
-        response.raise_for_status()
-        return response.json()
+    key = (endpoint, tuple(sorted((params or {}).items())))
+    if key in _cache:
+        return _cache[key]
+    
+    # Join an identical request that is already in flight, if any. The shield
+    # keeps one caller's cancellation from cancelling the shared request.
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.create_task(load_data(key, endpoint, params))
+        _inflight[key] = task
+        task.add_done_callback(lambda done: finish_request(key, done))
+    return await asyncio.shield(task)
 
 
-@app.list_tools()
-async def list_tools() -> list[Tool]:
-    """List available tools for the F1 data server."""
-    return [
-        Tool(
-            name="get_sessions",
-            description=(
-                "Retrieve F1 race sessions. Can filter by year, country, circuit, session type, etc. "
-                "Returns session details including session_key, date, location, and type. "
-                "Available filters: year, country_name, circuit_short_name, session_name, session_type, "
-                "session_key, date_start (>=, <=), location, country_code, meeting_key, gmt_offset."
-            ),
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "year": {
-                        "type": "integer",
-                        "description": "Filter by year (e.g., 2023, 2024)"
-                    },
-                    "country_name": {
-                        "type": "string",
-                        "description": "Filter by country name (e.g., 'Monaco', 'Italy')"
-                    },
-                    "circuit_short_name": {
-                        "type": "string",
-                        "description": "Filter by circuit short name (e.g., 'Monza', 'Monaco')"
-                    },
-                    "session_name": {
-                        "type": "string",
-                        "description": "Filter by session name (e.g., 'Race', 'Qualifying', 'Sprint')"
-                    },
-                    "session_key": {
-                        "type": "integer",
-                        "description": "Get specific session by session_key"
-                    },
-                    "date_start": {
-                        "type": "string",
-                        "description": "Filter by start date (ISO format: YYYY-MM-DD)"
-                    }
-                }
-            }
-        ),
-        Tool(
-            name="get_drivers",
-            description=(
-                "Retrieve driver information. Can get all drivers or filter by session_key. "
-                "Returns driver details including name, number, team, country, and headshot URL. "
-                "If session_key is provided, returns drivers who participated in that specific session."
-            ),
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "session_key": {
-                        "type": "integer",
-                        "description": "Optional: Filter drivers by session_key to get drivers from a specific session"
-                    },
-                    "driver_number": {
-                        "type": "integer",
-                        "description": "Optional: Filter by driver number (e.g., 1, 44, 16)"
-                    },
-                    "team_name": {
-                        "type": "string",
-                        "description": "Optional: Filter by team name (e.g., 'Red Bull Racing', 'Ferrari')"
-                    }
-                }
-            }
-        ),
-        Tool(
-            name="get_laps",
-            description=(
-                "Retrieve lap data for specific sessions, drivers, and laps. "
-                "Returns detailed lap information including lap time, sector times, duration, and position. "
-                "Can filter by session_key, driver_number, lap_number, and other parameters."
-            ),
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "session_key": {
-                        "type": "integer",
-                        "description": "Filter by session_key (required for meaningful results)"
-                    },
-                    "driver_number": {
-                        "type": "integer",
-                        "description": "Filter by driver number (e.g., 1, 44, 16)"
-                    },
-                    "lap_number": {
-                        "type": "integer",
-                        "description": "Filter by specific lap number"
-                    }
-                }
-            }
-        ),
-        Tool(
-            name="get_pit_stops",
-            description=(
-                "Retrieve pit stop data for specific sessions. "
-                "Returns detailed pit stop information including duration, lap number, and timing. "
-                "Can filter by session_key, driver_number, and set upper bound on pit duration."
-            ),
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "session_key": {
-                        "type": "integer",
-                        "description": "Filter by session_key (required for meaningful results)"
-                    },
-                    "driver_number": {
-                        "type": "integer",
-                        "description": "Optional: Filter by driver number (e.g., 1, 44, 16)"
-                    },
-                    "pit_duration": {
-                        "type": "number",
-                        "description": "Optional: Upper bound for pit duration in seconds (e.g., 30.0 for stops under 30 seconds)"
-                    }
-                }
-            }
-        ),
-        Tool(
-            name="get_overtakes",
-            description=(
-                "Retrieve overtake data showing position changes between drivers. "
-                "An overtake refers to one driver (overtaking driver) exchanging positions with another driver (overtaken driver). "
-                "Returns detailed overtake information including drivers involved, lap number, and timing. "
-                "Can filter by session_key, overtaking driver, and overtaken driver."
-            ),
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "session_key": {
-                        "type": "integer",
-                        "description": "Filter by session_key (required for meaningful results)"
-                    },
-                    "overtaking_driver_number": {
-                        "type": "integer",
-                        "description": "Optional: Filter by the driver number of the overtaking driver"
-                    },
-                    "overtaken_driver_number": {
-                        "type": "integer",
-                        "description": "Optional: Filter by the driver number of the overtaken driver"
-                    }
-                }
-            }
-        )
-    ]
+async def load_data(key: tuple, endpoint: str, params: Optional[dict]) -> Any:
+    """Request and decode an API response and store it in the cache."""
+    response = await send_request(endpoint, params)
+    try:
+        data = json_loads(response.content)
+    except ValueError:
+        raise httpx.DecodingError("The API returned a response that is not valid JSON", request=response.request)
+    if _cache.getsizeof(data) <= CACHE_MAX_RECORDS:
+        _cache[key] = data
+    return data
 
 
-@app.call_tool()
-async def call_tool(name: str, arguments: Any) -> list[TextContent]:
-    """Handle tool calls for F1 data retrieval."""
+def finish_request(key: tuple, task: asyncio.Task) -> None:
+    """Forget a finished in-flight request."""
+    _inflight.pop(key, None)
+    # Mark a failure as seen in case every caller was cancelled meanwhile
+    if not task.cancelled():
+        task.exception()
+
+
+async def fetch_many(requests: list[tuple[str, Optional[dict]]]) -> list[Any]:
+    """
+    Fetch several OpenF1 endpoints concurrently.
     
-    if name == "get_sessions":
-        # Build query parameters from arguments
-        params = {}
-        
-        if "year" in arguments:
-            params["year"] = arguments["year"]
-        if "country_name" in arguments:
-            params["country_name"] = arguments["country_name"]
-        if "circuit_short_name" in arguments:
-            params["circuit_short_name"] = arguments["circuit_short_name"]
-        if "session_name" in arguments:
-            params["session_name"] = arguments["session_name"]
-        if "session_key" in arguments:
-            params["session_key"] = arguments["session_key"]
-        if "date_start" in arguments:
-            params["date_start"] = arguments["date_start"]
+    Args:
+        requests: List of (endpoint, params) pairs
         
-        try:
-            sessions = await fetch_data("sessions", params)
-            
-            if not sessions:
-                return [TextContent(
-                    type="text",
-                    text="No sessions found matching the criteria."
-                )]
-            
-            # Format the response
-            result = f"Found {len(sessions)} session(s):\n\n"
-            for session in sessions:
-                result += f"Session Key: {session.get('session_key')}\n"
-                result += f"Name: {session.get('session_name')}\n"
-                result += f"Type: {session.get('session_type')}\n"
-                result += f"Date: {session.get('date_start')}\n"
-                result += f"Location: {session.get('location')}\n"
-                result += f"Country: {session.get('country_name')}\n"
-                result += f"Circuit: {session.get('circuit_short_name')}\n"
-                result += f"Year: {session.get('year')}\n"
-                result += f"Meeting Key: {session.get('meeting_key')}\n"
-                result += "-" * 50 + "\n\n"
-            
-            return [TextContent(type="text", text=result)]
-            
-        except httpx.HTTPError as e:
-            return [TextContent(
-                type="text",
-                text=f"Error fetching sessions: {str(e)}"
-            )]
+    Returns:
+        Results in the same order as requests. A failed request yields its
+        exception instead of a result, without cancelling the others.
+    """
+    return await asyncio.gather(
+        *(fetch_data(endpoint, params) for endpoint, params in requests),
+        return_exceptions=True
+    )
+
+
+def has_list_param(params: Optional[dict]) -> bool:
+    """Return whether any query parameter holds a list of values."""
+    return any(isinstance(value, list) for value in (params or {}).values())
+
+
+async def fetch_records(endpoint: str, params: Optional[dict] = None) -> list:
+    """
+    Fetch records from the OpenF1 API, accepting lists of parameter values.
     
-    elif name == "get_drivers":
-        # Build query parameters from arguments
-        params = {}
-        
-        if "session_key" in arguments:
-            params["session_key"] = arguments["session_key"]
-        if "driver_number" in arguments:
-            params["driver_number"] = arguments["driver_number"]
-        if "team_name" in arguments:
-            params["team_name"] = arguments["team_name"]
+    The API filters on one value per parameter, so a list-valued parameter
+    (e.g. driver_number=[1, 44]) is fanned out into one request per distinct
+    value, all sent concurrently, and the results are merged in order.
+    
+    Args:
+        endpoint: API endpoint path
+        params: Optional query parameters, any of which may be a list
         
-        try:
-            drivers = await fetch_data("drivers", params)
-            
-            if not drivers:
-                return [TextContent(
-                    type="text",
-                    text="No drivers found matching the criteria."
-                )]
-            
-            # Format the response
-            session_info = f" for session {arguments['session_key']}" if "session_key" in arguments else ""
-            result = f"Found {len(drivers)} driver(s){session_info}:\n\n"
-            
-            for driver in drivers:
-                result += f"Driver Number: {driver.get('driver_number')}\n"
-                result += f"Name: {driver.get('full_name')}\n"
-                result += f"Abbreviation: {driver.get('name_acronym')}\n"
-                result += f"Team: {driver.get('team_name')}\n"
-                result += f"Country: {driver.get('country_code')}\n"
-                result += f"Headshot: {driver.get('headshot_url')}\n"
-                if "session_key" in driver:
-                    result += f"Session Key: {driver.get('session_key')}\n"
-                result += "-" * 50 + "\n\n"
-            
-            return [TextContent(type="text", text=result)]
-            
-        except httpx.HTTPError as e:
-            return [TextContent(
-                type="text",
-                text=f"Error fetching drivers: {str(e)}"
-            )]
+    Returns:
+        The combined records
+    """
+    if not has_list_param(params):
+        return await fetch_data(endpoint, params)
+    
+    list_keys = [key for key, value in params.items() if isinstance(value, list)]
+    requests = [
+        (endpoint, {**params, **dict(zip(list_keys, values))})
+        for values in itertools.product(*(dict.fromkeys(params[key]) for key in list_keys))
+    ]
     
-    elif name == "get_laps":
-        # Build query parameters from arguments
-        params = {}
+    records = []
+    for result in await fetch_many(requests):
+        if isinstance(result, BaseException):
+            raise result
+        records.extend(result)
+    return records
+
+
+def compile_formatter(fields: tuple) -> Callable[[dict], str]:
+    """
+    Build a formatter that renders records laid out by a field table.
+    
+    The required fields, which come first in every table, are merged into a
+    single format string so each record needs one format call for them; only
+    the optional fields are checked one by one.
+    
+    Args:
+        fields: Field layout, e.g. LAP_FIELDS
         
-        if "session_key" in arguments:
-            params["session_key"] = arguments["session_key"]
-        if "driver_number" in arguments:
-            params["driver_number"] = arguments["driver_number"]
-        if "lap_number" in arguments:
-            params["lap_number"] = arguments["lap_number"]
+    Returns:
+        A function formatting one record as labelled lines followed by the
+        record separator
+    """
+    required_keys = tuple(key for key, _, required in fields if required)
+    optional_fields = tuple((key, line) for key, line, required in fields if not required)
+    if any(required for _, _, required in fields[len(required_keys):]):
+        raise ValueError("required fields must come before optional fields")
+    template = "".join(line for _, line, required in fields if required)
+    
+    def format_record(record: dict) -> str:
+        get = record.get
+        lines = [template.format(*map(get, required_keys))]
+        for key, line in optional_fields:
+            value = get(key)
+            if value is not None:
+                lines.append(line.format(value))
+        lines.append(SEPARATOR)
+        return "".join(lines)
+    
+    return format_record
+
+
+format_session = compile_formatter(SESSION_FIELDS)
+format_driver = compile_formatter(DRIVER_FIELDS)
+format_lap = compile_formatter(LAP_FIELDS)
+format_pit_stop = compile_formatter(PIT_STOP_FIELDS)
+format_overtake = compile_formatter(OVERTAKE_FIELDS)
+
+
+def format_records(records: list, formatter: Callable[[dict], str], fields: tuple) -> str:
+    """
+    Format records for a text response.
+    
+    Small result sets are shown as labelled lines per record. Larger ones
+    are written as CSV with a single header row, which is several times
+    shorter for the model to read.
+    
+    Args:
+        records: Records returned by the OpenF1 API
+        formatter: Compiled formatter for one record, e.g. format_lap
+        fields: Field layout used for the CSV columns, e.g. LAP_FIELDS
         
-        try:
-            laps = await fetch_data("laps", params)
-            
-            if not laps:
-                return [TextContent(
-                    type="text",
-                    text="No lap data found matching the criteria."
-                )]
-            
-            # Format the response
-            filters = []
-            if "session_key" in arguments:
-                filters.append(f"session {arguments['session_key']}")
-            if "driver_number" in arguments:
-                filters.append(f"driver #{arguments['driver_number']}")
-            if "lap_number" in arguments:
-                filters.append(f"lap {arguments['lap_number']}")
-            
-            filter_str = " for " + ", ".join(filters) if filters else ""
-            result = f"Found {len(laps)} lap(s){filter_str}:\n\n"
-            
-            for lap in laps:
-                result += f"Lap Number: {lap.get('lap_number')}\n"
-                result += f"Driver Number: {lap.get('driver_number')}\n"
-                result += f"Session Key: {lap.get('session_key')}\n"
-                
-                if lap.get('lap_duration'):
-                    result += f"Lap Duration: {lap.get('lap_duration')} seconds\n"
-                if lap.get('duration_sector_1'):
-                    result += f"Sector 1: {lap.get('duration_sector_1')} seconds\n"
-                if lap.get('duration_sector_2'):
-                    result += f"Sector 2: {lap.get('duration_sector_2')} seconds\n"
-                if lap.get('duration_sector_3'):
-                    result += f"Sector 3: {lap.get('duration_sector_3')} seconds\n"
-                
-                if lap.get('segments_sector_1'):
-                    result += f"Sector 1 Segments: {lap.get('segments_sector_1')}\n"
-                if lap.get('segments_sector_2'):
-                    result += f"Sector 2 Segments: {lap.get('segments_sector_2')}\n"
-                if lap.get('segments_sector_3'):
-                    result += f"Sector 3 Segments: {lap.get('segments_sector_3')}\n"
-                
-                if lap.get('i1_speed') is not None:
-                    result += f"Speed Trap 1 (I1): {lap.get('i1_speed')} km/h\n"
-                if lap.get('i2_speed') is not None:
-                    result += f"Speed Trap 2 (I2): {lap.get('i2_speed')} km/h\n"
-                if lap.get('st_speed') is not None:
-                    result += f"Speed Trap (ST): {lap.get('st_speed')} km/h\n"
-                
-                if lap.get('is_pit_out_lap') is not None:
-                    result += f"Pit Out Lap: {lap.get('is_pit_out_lap')}\n"
-                
-                if lap.get('date_start'):
-                    result += f"Start Time: {lap.get('date_start')}\n"
-                
-                result += "-" * 50 + "\n\n"
-            
-            return [TextContent(type="text", text=result)]
-            
-        except httpx.HTTPError as e:
-            return [TextContent(
-                type="text",
-                text=f"Error fetching lap data: {str(e)}"
-            )]
+    Returns:
+        The formatted records
+    """
+    if len(records) <= CSV_THRESHOLD:
+        return "".join(map(formatter, records))
+    
+    keys = [key for key, _, _ in fields]
+    output = io.StringIO()
+    writer = csv.writer(output, lineterminator="\n")
+    writer.writerow(keys)
+    writer.writerows([record.get(key) for key in keys] for record in records)
+    return output.getvalue()
+
+
+def format_driver_numbers(value: Any) -> str:
+    """Format one driver number or a list of them for a response header, e.g. '#1, #44'."""
+    numbers = dict.fromkeys(value) if isinstance(value, list) else [value]
+    return ", ".join(f"#{number}" for number in numbers)
+
+
+def page_bounds(arguments: dict) -> tuple[int, int]:
+    """
+    Read and check the limit and offset arguments of a tool call.
     
-    elif name == "get_pit_stops":
-        # Build query parameters from arguments
-        params = {}
+    Args:
+        arguments: Tool call arguments
         
-        if "session_key" in arguments:
-            params["session_key"] = arguments["session_key"]
-        if "driver_number" in arguments:
-            params["driver_number"] = arguments["driver_number"]
-        if "pit_duration" in arguments:
-            # Use <= operator for upper bound
-            params["pit_duration"] = f"<={arguments['pit_duration']}"
+    Returns:
+        The limit and offset
         
-        try:
-            pit_stops = await fetch_data("pit", params)
-            
-            if not pit_stops:
-                return [TextContent(
-                    type="text",
-                    text="No pit stop data found matching the criteria."
-                )]
-            
-            # Format the response
-            filters = []
-            if "session_key" in arguments:
-                filters.append(f"session {arguments['session_key']}")
-            if "driver_number" in arguments:
-                filters.append(f"driver #{arguments['driver_number']}")
-            if "pit_duration" in arguments:
-                filters.append(f"duration ≤ {arguments['pit_duration']}s")
-            
-            filter_str = " for " + ", ".join(filters) if filters else ""
-            result = f"Found {len(pit_stops)} pit stop(s){filter_str}:\n\n"
-            
-            for pit in pit_stops:
-                result += f"Driver Number: {pit.get('driver_number')}\n"
-                result += f"Session Key: {pit.get('session_key')}\n"
-                result += f"Lap Number: {pit.get('lap_number')}\n"
-                
-                if pit.get('pit_duration') is not None:
-                    result += f"Pit Duration: {pit.get('pit_duration')} seconds\n"
-                
-                if pit.get('date'):
-                    result += f"Time: {pit.get('date')}\n"
-                
-                if pit.get('meeting_key') is not None:
-                    result += f"Meeting Key: {pit.get('meeting_key')}\n"
-                
-                result += "-" * 50 + "\n\n"
-            
-            return [TextContent(type="text", text=result)]
-            
-        except httpx.HTTPError as e:
-            return [TextContent(
-                type="text",
-                text=f"Error fetching pit stop data: {str(e)}"
-            )]
+    Raises:
+        ValueError: If limit or offset is not a valid integer
+    """
+    try:
+        limit = int(arguments.get("limit", DEFAULT_LIMIT))
+        offset = int(arguments.get("offset", 0))
+    except (TypeError, ValueError):
+        raise ValueError("limit and offset must be integers")
+    if limit < 1 or offset < 0:
+        raise ValueError("limit must be at least 1 and offset must not be negative")
+    return limit, offset
+
+
+def page_records(records: list, arguments: dict) -> tuple[list, int]:
+    """
+    Select the records requested by the limit and offset arguments.
     
-    elif name == "get_overtakes":
-        # Build query parameters from arguments
-        params = {}
+    Args:
+        records: All records returned by the OpenF1 API
+        arguments: Tool call arguments, already checked by page_bounds
         
-        if "session_key" in arguments:
-            params["session_key"] = arguments["session_key"]
-        if "overtaking_driver_number" in arguments:
-            params["overtaking_driver_number"] = arguments["overtaking_driver_number"]
-        if "overtaken_driver_number" in arguments:
-            params["overtaken_driver_number"] = arguments["overtaken_driver_number"]
+    Returns:
+        The selected records and the offset of the first one
+    """
+    limit, offset = page_bounds(arguments)
+    return records[offset:offset + limit], offset
+
+
+def page_note(total: int, offset: int, shown: int) -> str:
+    """Describe which records a text response shows when it is not all of them."""
+    if shown == total:
+        return ""
+    if not shown:
+        return f"(No records at offset {offset}; {total} in total.)\n"
+    return f"\n(Showing records {offset + 1}-{offset + shown} of {total}; use offset to see more.)\n"
+
+
+def json_response(records: list, page: list, offset: int, params: dict) -> list[TextContent]:
+    """
+    Return API records as a JSON tool response.
+    
+    Args:
+        records: All records returned by the OpenF1 API
+        page: The records selected by limit and offset
+        offset: Offset of the first selected record
+        params: Query parameters used to fetch them
         
+    Returns:
+        A single TextContent holding the counts, filters and selected records
+    """
+    return [TextContent(
+        type="text",
+        text=json_dumps({
+            "count": len(records),
+            "offset": offset,
+            "returned": len(page),
+            "filters": params,
+            "results": page
+        })
+    )]
+
+
+# Tool definitions, built once at import time
+TOOLS: list[Tool] = [
+    Tool(
+        name="get_sessions",
+        description=(
+            "Retrieve F1 race sessions. Can filter by year, country, circuit, session type, etc. "
+            "Returns session details including session_key, date, location, and type. "
+            "Available filters: year, country_name, circuit_short_name, session_name, session_type, "
+            "session_key, date_start (>=, <=), location, country_code, meeting_key, gmt_offset."
+        ),
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "year": {
+                    "type": "integer",
+                    "description": "Filter by year (e.g., 2023, 2024)"
+                },
+                "country_name": {
+                    "type": "string",
+                    "description": "Filter by country name (e.g., 'Monaco', 'Italy')"
+                },
+                "circuit_short_name": {
+                    "type": "string",
+                    "description": "Filter by circuit short name (e.g., 'Monza', 'Monaco')"
+                },
+                "session_name": {
+                    "type": "string",
+                    "description": "Filter by session name (e.g., 'Race', 'Qualifying', 'Sprint')"
+                },
+                "session_key": {
+                    "type": "integer",
+                    "description": "Get specific session by session_key"
+                },
+                "date_start": {
+                    "type": "string",
+                    "description": "Filter by start date (ISO format: YYYY-MM-DD)"
+                },
+                "session_type": {
+                    "type": "string",
+                    "description": "Filter by session type (e.g., 'Race', 'Qualifying', 'Practice')"
+                },
+                "location": {
+                    "type": "string",
+                    "description": "Filter by location (e.g., 'Monte Carlo', 'Silverstone')"
+                },
+                "country_code": {
+                    "type": "string",
+                    "description": "Filter by country code (e.g., 'MON', 'ITA')"
+                },
+                "meeting_key": {
+                    "type": "integer",
+                    "description": "Filter by meeting_key to get all sessions of a race weekend"
+                },
+                "gmt_offset": {
+                    "type": "string",
+                    "description": "Filter by GMT offset of the session (e.g., '02:00:00')"
+                },
+                "format": FORMAT_PROPERTY,
+                "limit": LIMIT_PROPERTY,
+                "offset": OFFSET_PROPERTY
+            }
+        }
+    ),
+    Tool(
+        name="get_drivers",
+        description=(
+            "Retrieve driver information. Can get all drivers or filter by session_key. "
+            "Returns driver details including name, number, team, country, and headshot URL. "
+            "If session_key is provided, returns drivers who participated in that specific session."
+        ),
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "session_key": {
+                    "type": "integer",
+                    "description": "Optional: Filter drivers by session_key to get drivers from a specific session"
+                },
+                "driver_number": {
+                    "type": ["integer", "array"],
+                    "items": {"type": "integer"},
+                    "description": "Optional: Filter by driver number (e.g., 1, 44, 16) or a list of driver numbers"
+                },
+                "team_name": {
+                    "type": "string",
+                    "description": "Optional: Filter by team name (e.g., 'Red Bull Racing', 'Ferrari')"
+                },
+                "format": FORMAT_PROPERTY,
+                "limit": LIMIT_PROPERTY,
+                "offset": OFFSET_PROPERTY
+            }
+        }
+    ),
+    Tool(
+        name="get_laps",
+        description=(
+            "Retrieve lap data for specific sessions, drivers, and laps. "
+            "Returns detailed lap information including lap time, sector times, duration, and position. "
+            "Can filter by session_key, driver_number, lap_number, and other parameters."
+        ),
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "session_key": {
+                    "type": "integer",
+                    "description": "Required: Filter by session_key (use get_sessions to find one)"
+                },
+                "driver_number": {
+                    "type": ["integer", "array"],
+                    "items": {"type": "integer"},
+                    "description": "Filter by driver number (e.g., 1, 44, 16) or a list of driver numbers"
+                },
+                "lap_number": {
+                    "type": "integer",
+                    "description": "Filter by specific lap number"
+                },
+                "format": FORMAT_PROPERTY,
+                "limit": LIMIT_PROPERTY,
+                "offset": OFFSET_PROPERTY
+            },
+            "required": ["session_key"]
+        }
+    ),
+    Tool(
+        name="get_pit_stops",
+        description=(
+            "Retrieve pit stop data for specific sessions. "
+            "Returns detailed pit stop information including duration, lap number, and timing. "
+            "Can filter by session_key, driver_number, and set upper bound on pit duration."
+        ),
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "session_key": {
+                    "type": "integer",
+                    "description": "Required: Filter by session_key (use get_sessions to find one)"
+                },
+                "driver_number": {
+                    "type": ["integer", "array"],
+                    "items": {"type": "integer"},
+                    "description": "Optional: Filter by driver number (e.g., 1, 44, 16) or a list of driver numbers"
+                },
+                "pit_duration": {
+                    "type": "number",
+                    "description": "Optional: Upper bound for pit duration in seconds (e.g., 30.0 for stops under 30 seconds)"
+                },
+                "format": FORMAT_PROPERTY,
+                "limit": LIMIT_PROPERTY,
+                "offset": OFFSET_PROPERTY
+            },
+            "required": ["session_key"]
+        }
+    ),
+    Tool(
+        name="get_overtakes",
+        description=(
+            "Retrieve overtake data showing position changes between drivers. "
+            "An overtake refers to one driver (overtaking driver) exchanging positions with another driver (overtaken driver). "
+            "Returns detailed overtake information including drivers involved, lap number, and timing. "
+            "Can filter by session_key, overtaking driver, and overtaken driver."
+        ),
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "session_key": {
+                    "type": "integer",
+                    "description": "Required: Filter by session_key (use get_sessions to find one)"
+                },
+                "overtaking_driver_number": {
+                    "type": "integer",
+                    "description": "Optional: Filter by the driver number of the overtaking driver"
+                },
+                "overtaken_driver_number": {
+                    "type": "integer",
+                    "description": "Optional: Filter by the driver number of the overtaken driver"
+                },
+                "format": FORMAT_PROPERTY,
+                "limit": LIMIT_PROPERTY,
+                "offset": OFFSET_PROPERTY
+            },
+            "required": ["session_key"]
+        }
+    )
+]
+
+
+@app.list_tools()
+async def list_tools() -> list[Tool]:
+    """List available tools for the F1 data server."""
+    return TOOLS
+
+
+async def handle_sessions(arguments: dict, params: dict) -> list[TextContent]:
+    """Handle get_sessions tool calls."""
+    sessions = await fetch_records(TOOL_ENDPOINTS["get_sessions"], params)
+    
+    page, offset = page_records(sessions, arguments)
+    
+    if arguments.get("format", DEFAULT_FORMAT) == "json":
+        return json_response(sessions, page, offset, params)
+    
+    if not sessions:
+        return [TextContent(
+            type="text",
+            text="No sessions found matching the criteria."
+        )]
+    
+    # Format the response
+    parts = [f"Found {len(sessions)} session(s):\n\n"]
+    parts.append(format_records(page, format_session, SESSION_FIELDS))
+    parts.append(page_note(len(sessions), offset, len(page)))
+    
+    return [TextContent(type="text", text="".join(parts))]
+
+
+async def handle_drivers(arguments: dict, params: dict) -> list[TextContent]:
+    """Handle get_drivers tool calls."""
+    drivers = await fetch_records(TOOL_ENDPOINTS["get_drivers"], params)
+    
+    page, offset = page_records(drivers, arguments)
+    
+    if arguments.get("format", DEFAULT_FORMAT) == "json":
+        return json_response(drivers, page, offset, params)
+    
+    if not drivers:
+        return [TextContent(
+            type="text",
+            text="No drivers found matching the criteria."
+        )]
+    
+    # Format the response
+    session_info = f" for session {arguments['session_key']}" if "session_key" in arguments else ""
+    parts = [f"Found {len(drivers)} driver(s){session_info}:\n\n"]
+    
+    parts.append(format_records(page, format_driver, DRIVER_FIELDS))
+    parts.append(page_note(len(drivers), offset, len(page)))
+    
+    return [TextContent(type="text", text="".join(parts))]
+
+
+async def handle_laps(arguments: dict, params: dict) -> list[TextContent]:
+    """Handle get_laps tool calls."""
+    laps = await fetch_records(TOOL_ENDPOINTS["get_laps"], params)
+    
+    page, offset = page_records(laps, arguments)
+    
+    if arguments.get("format", DEFAULT_FORMAT) == "json":
+        return json_response(laps, page, offset, params)
+    
+    if not laps:
+        return [TextContent(
+            type="text",
+            text="No lap data found matching the criteria."
+        )]
+    
+    # Format the response
+    filters = []
+    if "session_key" in arguments:
+        filters.append(f"session {arguments['session_key']}")
+    if "driver_number" in arguments:
+        filters.append(f"driver {format_driver_numbers(arguments['driver_number'])}")
+    if "lap_number" in arguments:
+        filters.append(f"lap {arguments['lap_number']}")
+    
+    filter_str = " for " + ", ".join(filters) if filters else ""
+    parts = [f"Found {len(laps)} lap(s){filter_str}:\n\n"]
+    
+    parts.append(format_records(page, format_lap, LAP_FIELDS))
+    parts.append(page_note(len(laps), offset, len(page)))
+    
+    return [TextContent(type="text", text="".join(parts))]
+
+
+async def handle_pit_stops(arguments: dict, params: dict) -> list[TextContent]:
+    """Handle get_pit_stops tool calls."""
+    if "pit_duration" in params:
         try:
-            overtakes = await fetch_data("overtakes", params)
-            
-            if not overtakes:
-                return [TextContent(
-                    type="text",
-                    text="No overtake data found matching the criteria."
-                )]
-            
-            # Format the response
-            filters = []
-            if "session_key" in arguments:
-                filters.append(f"session {arguments['session_key']}")
-            if "overtaking_driver_number" in arguments:
-                filters.append(f"overtaking driver #{arguments['overtaking_driver_number']}")
-            if "overtaken_driver_number" in arguments:
-                filters.append(f"overtaken driver #{arguments['overtaken_driver_number']}")
-            
-            filter_str = " for " + ", ".join(filters) if filters else ""
-            result = f"Found {len(overtakes)} overtake(s){filter_str}:\n\n"
-            
-            for overtake in overtakes:
-                result += f"Overtaking Driver: #{overtake.get('overtaking_driver_number')}\n"
-                result += f"Overtaken Driver: #{overtake.get('overtaken_driver_number')}\n"
-                result += f"Session Key: {overtake.get('session_key')}\n"
-                
-                if overtake.get('lap_number') is not None:
-                    result += f"Lap Number: {overtake.get('lap_number')}\n"
-                
-                if overtake.get('date'):
-                    result += f"Time: {overtake.get('date')}\n"
-                
-                if overtake.get('meeting_key') is not None:
-                    result += f"Meeting Key: {overtake.get('meeting_key')}\n"
-                
-                result += "-" * 50 + "\n\n"
-            
-            return [TextContent(type="text", text=result)]
-            
-        except httpx.HTTPError as e:
+            pit_duration = float(params["pit_duration"])
+        except (TypeError, ValueError):
             return [TextContent(
                 type="text",
-                text=f"Error fetching overtake data: {str(e)}"
+                text=f"Invalid pit_duration: {params['pit_duration']!r}. Expected a number of seconds."
             )]
+        # Use <= operator for upper bound
+        params["pit_duration"] = "<=" + repr(pit_duration)
     
-    else:
+    pit_stops = await fetch_records(TOOL_ENDPOINTS["get_pit_stops"], params)
+    
+    page, offset = page_records(pit_stops, arguments)
+    
+    if arguments.get("format", DEFAULT_FORMAT) == "json":
+        return json_response(pit_stops, page, offset, params)
+    
+    if not pit_stops:
+        return [TextContent(
+            type="text",
+            text="No pit stop data found matching the criteria."
+        )]
+    
+    # Format the response
+    filters = []
+    if "session_key" in arguments:
+        filters.append(f"session {arguments['session_key']}")
+    if "driver_number" in arguments:
+        filters.append(f"driver {format_driver_numbers(arguments['driver_number'])}")
+    if "pit_duration" in arguments:
+        filters.append(f"duration ≤ {arguments['pit_duration']}s")
+    
+    filter_str = " for " + ", ".join(filters) if filters else ""
+    parts = [f"Found {len(pit_stops)} pit stop(s){filter_str}:\n\n"]
+    
+    parts.append(format_records(page, format_pit_stop, PIT_STOP_FIELDS))
+    parts.append(page_note(len(pit_stops), offset, len(page)))
+    
+    return [TextContent(type="text", text="".join(parts))]
+
+
+async def handle_overtakes(arguments: dict, params: dict) -> list[TextContent]:
+    """Handle get_overtakes tool calls."""
+    overtakes = await fetch_records(TOOL_ENDPOINTS["get_overtakes"], params)
+    
+    page, offset = page_records(overtakes, arguments)
+    
+    if arguments.get("format", DEFAULT_FORMAT) == "json":
+        return json_response(overtakes, page, offset, params)
+    
+    if not overtakes:
+        return [TextContent(
+            type="text",
+            text="No overtake data found matching the criteria."
+        )]
+    
+    # Format the response
+    filters = []
+    if "session_key" in arguments:
+        filters.append(f"session {arguments['session_key']}")
+    if "overtaking_driver_number" in arguments:
+        filters.append(f"overtaking driver #{arguments['overtaking_driver_number']}")
+    if "overtaken_driver_number" in arguments:
+        filters.append(f"overtaken driver #{arguments['overtaken_driver_number']}")
+    
+    filter_str = " for " + ", ".join(filters) if filters else ""
+    parts = [f"Found {len(overtakes)} overtake(s){filter_str}:\n\n"]
+    
+    parts.append(format_records(page, format_overtake, OVERTAKE_FIELDS))
+    parts.append(page_note(len(overtakes), offset, len(page)))
+    
+    return [TextContent(type="text", text="".join(parts))]
+
+
+# Handler for each tool, looked up by tool name in call_tool
+HANDLERS: dict[str, Callable[[dict, dict], Awaitable[list[TextContent]]]] = {
+    "get_sessions": handle_sessions,
+    "get_drivers": handle_drivers,
+    "get_laps": handle_laps,
+    "get_pit_stops": handle_pit_stops,
+    "get_overtakes": handle_overtakes,
+}
+
+
+@app.call_tool()
+async def call_tool(name: str, arguments: Any) -> list[TextContent]:
+    """Handle tool calls for F1 data retrieval."""
+    handler = HANDLERS.get(name)
+    if handler is None:
         return [TextContent(
             type="text",
             text=f"Unknown tool: {name}"
         )]
+    
+    if name in SESSION_KEY_REQUIRED and "session_key" not in arguments:
+        return [TextContent(
+            type="text",
+            text=f"{name} requires a session_key. Use get_sessions to find the session_key for a session."
+        )]
+    
+    # Reject bad paging arguments before anything is fetched
+    try:
+        page_bounds(arguments)
+    except ValueError as e:
+        return [TextContent(
+            type="text",
+            text=f"Invalid arguments for {name}: {str(e)}"
+        )]
+    
+    response_key = (name, json.dumps(arguments, sort_keys=True, default=str))
+    if response_key in _response_cache:
+        return [TextContent(type="text", text=text) for text in _response_cache[response_key]]
+    
+    # Build query parameters from the arguments the tool accepts
+    params = {key: arguments[key] for key in TOOL_PARAMS[name] if key in arguments}
+    
+    try:
+        result = await handler(arguments, params)
+    except httpx.HTTPError as e:
+        return [TextContent(
+            type="text",
+            text=f"Error fetching {TOOL_DATA_NAMES[name]}: {str(e)}"
+        )]
+    
+    _response_cache[response_key] = tuple(content.text for content in result)
+    return result
 
 
-async def main():
-    """Run the MCP server."""
-    async with stdio_server() as (read_stream, write_stream):
-        await app.run(
-            read_stream,
-            write_stream,
-            app.create_initialization_options()
-        )
+async def main(cache_path: Optional[str] = None):
+    """
+    Run the MCP server.
+    
+    Args:
+        cache_path: Optional directory for the on-disk response cache
+    """
+    global cache_dir
+    if cache_path:
+        cache_dir = cache_path
+    
+    # Connect to the API in the background so the MCP handshake is not held
+    # up by a slow or unreachable network
+    warm_up = asyncio.create_task(warm_client())
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await app.run(
+                read_stream,
+                write_stream,
+                app.create_initialization_options()
+            )
+    finally:
+        warm_up.cancel()
+        await close_client()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description="OpenF1 MCP Server")
+    parser.add_argument(
+        "--cache-dir",
+        default=DEFAULT_CACHE_DIR,
+        help="Directory for the on-disk response cache (requires hishel)"
+    )
+    args = parser.parse_args()
+    
+    # Use the faster uvloop event loop when it is installed
+    try:
+        import uvloop
+    except ImportError:
+        uvloop = None
+    
+    if uvloop is not None:
+        uvloop.run(main(args.cache_dir))
+    else:
+        asyncio.run(main(args.cache_dir))